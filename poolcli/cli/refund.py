@@ -1,7 +1,11 @@
 """Refund management CLI commands."""
 
+import sys
+from typing import Optional
+
 import click
 
+from poolcli.core import token_cache
 from poolcli.core.auth import AuthService
 from poolcli.core.config import settings
 from poolcli.core.refund_manager import RefundManager
@@ -20,20 +24,28 @@ def refund() -> None:
 @refund.command()
 @click.option("--wallet-name", required=True, prompt="Wallet name", help="Wallet name")
 @click.option("--backend-url", default=settings.API_URL)
-def create(wallet_name: str, backend_url: str) -> None:
+@click.option("--key-id", default=None, help="Developer key ID to refund (skips the interactive picker)")
+def create(wallet_name: str, backend_url: str, key_id: Optional[str]) -> None:
     """Create refund invoice for a developer key."""
     Console.header("💸 Creating refund invoice for developer key")
 
     try:
-        auth_service = AuthService(backend_url)
-        token, _ = auth_service.authenticate_with_wallet(wallet_name, requires_unlock=False)
+        token = token_cache.get_or_refresh(
+            wallet_name,
+            backend_url,
+            lambda force: AuthService(backend_url).authenticate_with_wallet(
+                wallet_name, force=force, requires_unlock=False
+            ),
+        )
 
         if not token:
             Console.error("Authentication required.")
             return
 
         refund_manager = RefundManager(backend_url=backend_url)
-        refund_manager.create_refund_invoice(token)
+        refund_manager.create_refund_invoice(token, key_id=key_id)
+    except click.Abort:
+        raise
     except (AuthenticationError, APIError, RefundError) as e:
         Console.error(str(e))
     except Exception as e:
@@ -45,44 +57,77 @@ def create(wallet_name: str, backend_url: str) -> None:
 @click.option("--backend-url", default=settings.API_URL)
 @click.option("--page", default=1, help="Page number")
 @click.option("--limit", default=15, help="Refunds per page")
-def list(wallet_name: str, backend_url: str, page: int, limit: int) -> None:
+@click.option("--details", is_flag=True, help="Also fetch and show full details for every listed refund")
+@click.option("--no-cache", is_flag=True, help="Ignore stored responses and fetch everything fresh")
+@click.option("--all", "all_pages", is_flag=True, help="List every page (ignores --page)")
+def list(
+    wallet_name: str, backend_url: str, page: int, limit: int, details: bool, no_cache: bool, all_pages: bool
+) -> None:
     """List all refund invoices for this wallet."""
-    Console.header(f"📜 Listing refunds for wallet '{wallet_name}'")
-
-    try:
-        auth_service = AuthService(backend_url)
-        token, _ = auth_service.authenticate_with_wallet(wallet_name, requires_unlock=False)
-        if not token:
-            Console.error("Authentication required.")
-            return
-
-        refund_manager = RefundManager(backend_url)
-        result = refund_manager.list_refund_invoices(token, page, limit)
-        refund_manager.display_refund_list(result["refunds"], result["pagination"])
-
-    except (AuthenticationError, RefundError, APIError) as e:
-        Console.error(str(e))
-    except Exception as e:
-        Console.error(f"Unexpected error: {e}")
+    # When piped, stdout carries only the TSV listing; status messages go to stderr.
+    piped = not sys.stdout.isatty()
+    if piped and details:
+        raise click.UsageError("--details is only available in a terminal; piped output is TSV only.")
+
+    with Console.redirect_to_stderr(piped):
+        Console.header(f"📜 Listing refunds for wallet '{wallet_name}'")
+
+        try:
+            token = token_cache.get_or_refresh(
+                wallet_name,
+                backend_url,
+                lambda force: AuthService(backend_url).authenticate_with_wallet(
+                    wallet_name, force=force, requires_unlock=False
+                ),
+            )
+            if not token:
+                Console.error("Authentication required.")
+                return
+
+            refund_manager = RefundManager(backend_url, use_cache=not no_cache)
+            if all_pages:
+                pages = refund_manager.iter_refund_pages(token, limit)
+            else:
+                pages = iter([refund_manager.list_refund_invoices(token, page, limit)])
+
+            for result in pages:
+                refund_manager.display_refund_list(result["refunds"], result["pagination"])
+
+                if details:
+                    refund_ids = [refund["refundId"] for refund in result["refunds"] if refund.get("refundId")]
+                    refund_details = refund_manager.get_many_refund_details(token, refund_ids)
+                    for refund_id, detail in refund_details.items():
+                        refund_manager.display_refund_details(refund_id, detail)
+
+        except (AuthenticationError, RefundError, APIError) as e:
+            Console.error(str(e))
+        except Exception as e:
+            Console.error(f"Unexpected error: {e}")
 
 
 @refund.command()
 @click.option("--refund-id", required=True, prompt="Refund ID", help="Refund ID")
 @click.option("--wallet-name", required=True, prompt="Wallet name", help="Wallet name")
 @click.option("--backend-url", default=settings.API_URL)
-def get(refund_id: str, wallet_name: str, backend_url: str) -> None:
+@click.option("--no-cache", is_flag=True, help="Ignore stored responses and fetch everything fresh")
+def get(refund_id: str, wallet_name: str, backend_url: str, no_cache: bool) -> None:
     """Fetch detailed refund invoice info."""
     Console.header(f"🔍 Fetching refund details: {refund_id}")
 
     try:
-        auth_service = AuthService(backend_url)
-        token, _ = auth_service.authenticate_with_wallet(wallet_name, requires_unlock=False)
+        token = token_cache.get_or_refresh(
+            wallet_name,
+            backend_url,
+            lambda force: AuthService(backend_url).authenticate_with_wallet(
+                wallet_name, force=force, requires_unlock=False
+            ),
+        )
 
         if not token:
             Console.error("Authentication required.")
             return
 
-        refund_manager = RefundManager(backend_url)
+        refund_manager = RefundManager(backend_url, use_cache=not no_cache)
         refund_manager.get_refund_details(token, refund_id)
     except (AuthenticationError, RefundError, APIError) as e:
         Console.error(str(e))
@@ -7,6 +7,7 @@ from bittensor_wallet import Wallet
 
 from poolcli.core.config import settings
 from poolcli.core.constants import apiRoutes
+from poolcli.core.refund_manager import clear_refund_cache
 from poolcli.exceptions import AuthenticationError
 from poolcli.utils.api_client import APIClient
 from poolcli.utils.bittensor_utils import get_wallet_by_name
@@ -106,7 +107,8 @@ class AuthService:
             return False
 
     def logout_all(self) -> None:
-        """Clear all stored authentication tokens."""
+        """Clear all stored authentication tokens and cached refund data."""
+        clear_refund_cache()
         config_file = get_config_file()
         if not config_file.exists():
             raise AuthenticationError("No stored sessions found.")
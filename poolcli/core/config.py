@@ -14,6 +14,13 @@ class Settings(BaseSettings):
     )
     API_URL: str = Constants.TAOMININGPOOL_API_URL
     CONFIG_PATH: Path = Path.home() / ".poolcli"
+    # Ask the backend to return only refund-eligible keys (updated more than 30 days ago).
+    REFUND_SERVER_SIDE_FILTER: bool = False
+    # Fetch refund details through the batch endpoint instead of one request per refund.
+    REFUND_BATCH_DETAILS: bool = False
+    # Reuse the backend's session cookie instead of the bearer token once it issues one.
+    SESSION_COOKIE_AUTH: bool = False
+    SESSION_COOKIE_NAME: str = "session"
 
 
 settings = Settings()
@@ -30,6 +30,7 @@ class RefundRoute:
     CREATE_REFUND_INVOICE: str = "/api/v1/refund/create/developer-key"
     LIST_REFUND_INVOICES: str = "/api/v1/refund/get/list"
     GET_REFUND_DETAILS: str = "/api/v1/refund"
+    BATCH_GET_REFUND_DETAILS: str = "/api/v1/refund:batchGet"
 
 
 class ApiRoute(BaseSettings):
@@ -15,9 +15,9 @@ from poolcli.utils.console import Console
 class KeyManager:
     """Service for managing developer keys."""
 
-    def __init__(self, backend_url: str = settings.API_URL) -> None:
+    def __init__(self, backend_url: str = settings.API_URL, api_client: Optional[APIClient] = None) -> None:
         self.backend_url = backend_url
-        self.api_client = APIClient(self.backend_url)
+        self.api_client = api_client or APIClient(self.backend_url)
 
     def create_invoice(self, token: str) -> Optional[dict[str, Any]]:
         """Create invoice + developer key (inactive until paid)."""
@@ -69,13 +69,21 @@ class KeyManager:
             return {}
 
     def list_developer_keys(
-        self, token: str, page: int = 1, limit: int = 15, status: Optional[str] = None
+        self,
+        token: str,
+        page: int = 1,
+        limit: int = 15,
+        status: Optional[str] = None,
+        updated_before: Optional[str] = None,
+        display: bool = True,
     ) -> dict[str, Any]:
-        """list all developer keys for a wallet."""
+        """list all developer keys for a wallet, showing them as a table unless ``display`` is False."""
         try:
             params = {"page": page, "limit": limit, "sortBy": "createdAt", "order": "desc"}
             if status:
                 params["status"] = status
+            if updated_before:
+                params["updatedBefore"] = updated_before
             response_json = self.api_client.create_request(path=apiRoutes.key.GET_DEV_KEYS, params=params, token=token)
             if response_json.get("data") is None:
                 raise KeyManagementError("Invalid response: 'data' field is None")
@@ -83,7 +91,8 @@ class KeyManager:
             keys_data = response_json["data"].get("data", [])
             pagination = response_json["data"].get("pagination", {})
 
-            Console.display_keys_table(keys_data)
+            if display:
+                Console.display_keys_table(keys_data)
             return {"keys": keys_data, "pagination": pagination}
         except requests.RequestException as e:
             raise APIError(f"API request failed: {e}")
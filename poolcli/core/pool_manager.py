@@ -4,8 +4,6 @@ from typing import Any, Optional
 
 import requests
 from bittensor_wallet import Wallet
-from prompt_toolkit.shortcuts import choice
-from prompt_toolkit.styles import Style
 
 from poolcli.core.config import settings
 from poolcli.core.constants import apiRoutes
@@ -49,6 +47,9 @@ class PoolManager:
             return
 
         Console.header("Available Unused Developer Keys")
+        from prompt_toolkit.shortcuts import choice
+        from prompt_toolkit.styles import Style
+
         result = choice(
             message="Please choose a developer key:",
             options=[(i, key["apiKey"]) for i, key in enumerate(unused_keys)],
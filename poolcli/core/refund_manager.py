@@ -1,110 +1,273 @@
 """Refund management service module."""
 
-from datetime import datetime, timedelta
+import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
+import click
 import requests
-from prompt_toolkit.shortcuts import choice
-from prompt_toolkit.styles import Style
 from rich.table import Table
 
+from poolcli.core.config import settings
 from poolcli.core.constants import apiRoutes
 from poolcli.core.key_manager import KeyManager
-from poolcli.exceptions import APIError, RefundError
+from poolcli.exceptions import APIError, APIResponseError, RefundError
 from poolcli.utils.api_client import APIClient
+from poolcli.utils.cache import ETagStore, token_fingerprint
 from poolcli.utils.console import Console
 
+# Last seen ETag and body per (token hash, path, query), reused across invocations via If-None-Match.
+_ETAG_STORE = ETagStore(settings.CONFIG_PATH / "refund_cache.json")
+
+_CREATE_PATH = apiRoutes.refund.CREATE_REFUND_INVOICE
+_LIST_PATH = apiRoutes.refund.LIST_REFUND_INVOICES
+_GET_DETAILS_BASE = apiRoutes.refund.GET_REFUND_DETAILS + "/"
+_BATCH_GET_PATH = apiRoutes.refund.BATCH_GET_REFUND_DETAILS
+
+
+def clear_refund_cache() -> None:
+    """Delete the refund responses stored for conditional requests, e.g. on logout."""
+    _ETAG_STORE.clear()
+
+
+# The subset of a refund invoice shown in listings, already formatted for display
+@dataclass(frozen=True, slots=True)
+class RefundRow:
+    refund_id: str
+    amount: str
+    status: str
+    created: str
+
+
+def _rows_from(refunds: list[dict[str, Any]]) -> list[RefundRow]:
+    """Convert raw refund dicts from the API into display rows."""
+    to_full_date = RefundManager.to_full_date
+    return [
+        RefundRow(
+            refund_id=refund.get("refundId", "N/A"),
+            amount=str(refund.get("amountDue", 5)),
+            status=refund.get("status", "unknown").upper(),
+            created=to_full_date(refund.get("createdAt")),
+        )
+        for refund in refunds
+    ]
+
 
 class RefundManager:
     """Handles refund creation and listing."""
 
-    def __init__(self, backend_url: str):
-        self.backend_url = backend_url
-        self.api_client = APIClient(self.backend_url)
+    __slots__ = (
+        "backend_url",
+        "api_client",
+        "use_cache",
+        "_batch_supported",
+        "_tsv_header_written",
+    )
 
-    def create_refund_invoice(self, token: str) -> Optional[dict[str, Any]]:
-        """Create refund invoice for developer key."""
-        try:
-            key_manager = KeyManager(self.backend_url)
-            keys_result = key_manager.list_developer_keys(token=token, page=1, limit=100, status="expired")
-            expired_keys = keys_result["keys"]
+    def __init__(self, backend_url: str, api_client: Optional[APIClient] = None, use_cache: bool = True):
+        self.backend_url = backend_url
+        self.api_client = api_client or APIClient(self.backend_url)
+        self.use_cache = use_cache
+        # Cleared when the backend answers the batch lookup with 404/405, so we don't retry it.
+        self._batch_supported = True
+        # Piped listings print the TSV header once, even when several pages are displayed.
+        self._tsv_header_written = False
 
-            if not expired_keys:
-                return
-            else:
-                Console.header("Expired Developer Keys - Available for Refund")
-                result = choice(
-                    message="Please choose a developer key:",
-                    options=[(i, key["apiKey"]) for i, key in enumerate(expired_keys)],
-                    default="salad",
-                    style=Style.from_dict(
-                        {
-                            "selected-option": "bold green",
-                        }
-                    ),
-                )
-                selected_key = expired_keys[result]
-                key_id = selected_key["keyId"]
+    def create_refund_invoice(self, token: str, key_id: Optional[str] = None) -> Optional[dict[str, Any]]:
+        """Create refund invoice for developer key.
 
-                payload = {"keyId": key_id}
-                response = self.api_client.create_request(
-                    path=apiRoutes.refund.CREATE_REFUND_INVOICE, method="POST", json_data=payload, token=token
-                )
-                data = response.get("data", {})
-                Console.print_table(
-                    "Refund Invoice Details",
-                    [
-                        f"{'ID':<25} {data.get('refundId', 'N/A')}",
-                        f"{'Amount':<25} {data.get('amount')} TAO",
-                        f"{'Status':<25 } {data.get('status', 'unknown').upper()}",
-                        f"{'Created:':<25} {self.to_full_date(data.get('createdAt'))}",
-                        f"{'Estimated refund Date:':<25} {self._get_estimated_refund_date(data.get('createdAt')).strftime('%A, %B %d, %Y')}",  # noqa: E501
-                    ],
-                )
-                Console.success("✅ Refund Invoice created successfully!")
+        When ``key_id`` is given the key listing and prompt are skipped, which
+        also makes the command usable from scripts.
+        """
+        try:
+            if key_id is None:
+                key_id = self._select_expired_key(token)
+                if key_id is None:
+                    return None
+            payload = {"keyId": key_id}
+            response = self.api_client.create_request(path=_CREATE_PATH, method="POST", json_data=payload, token=token)
+            data = response.get("data", {})
+            Console.print_table(
+                "Refund Invoice Details",
+                [
+                    f"{'ID':<25} {data.get('refundId', 'N/A')}",
+                    f"{'Amount':<25} {data.get('amount')} TAO",
+                    f"{'Status':<25} {data.get('status', 'unknown').upper()}",
+                    f"{'Created:':<25} {self.to_full_date(data.get('createdAt'))}",
+                    f"{'Estimated refund Date:':<25} {self._get_estimated_refund_date(data.get('createdAt')).strftime('%A, %B %d, %Y')}",  # noqa: E501
+                ],
+            )
+            Console.success("✅ Refund Invoice created successfully!")
+        except (click.Abort, RefundError):
+            raise
         except requests.RequestException as e:
             raise APIError(f"Request failed: {e}")
         except Exception as e:
             raise RefundError(f"Error creating refund invoice: {e}.")
 
-    def list_refund_invoices(self, token: str, page: int = 1, limit: int = 15) -> dict[str, Any]:
+    def _select_expired_key(self, token: str) -> Optional[str]:
+        """Show expired keys and return the id of the one the user picks."""
+        key_manager = KeyManager(self.backend_url, api_client=self.api_client)
+        updated_before = None
+        if settings.REFUND_SERVER_SIDE_FILTER:
+            updated_before = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()  # noqa: UP017
+        keys_result = key_manager.list_developer_keys(
+            token=token,
+            page=1,
+            limit=100,
+            status="expired",
+            updated_before=updated_before,
+            display=False,
+        )
+        expired_keys = keys_result["keys"]
+        if not expired_keys:
+            Console.warning("No expired developer keys available for refund.")
+            return None
+        if not sys.stdin.isatty():
+            raise RefundError("No terminal to choose a key from; pass --key-id instead")
+
+        Console.header("Expired Developer Keys - Available for Refund")
+        for idx, key in enumerate(expired_keys, 1):
+            Console.print(f"  [cyan]{idx}[/cyan]. {key['apiKey']}")
+        selected = click.prompt("Please choose a developer key", type=click.IntRange(1, len(expired_keys)))
+        return str(expired_keys[selected - 1]["keyId"])
+
+    def list_refund_invoices(
+        self, token: str, page: int = 1, limit: int = 15, show_status: bool = True
+    ) -> dict[str, Any]:
         """List user refund invoices."""
         try:
             params = {"page": page, "limit": limit}
-            response = self.api_client.create_request(
-                path=apiRoutes.refund.LIST_REFUND_INVOICES, params=params, token=token
-            )
-            refunds = response["data"].get("data", [])
-            pagination = response["data"].get("pagination", {})
+            data = self._conditional_get(token, _LIST_PATH, params=params, show_status=show_status)
+            refunds = data.get("data", [])
+            pagination = data.get("pagination", {})
             return {"refunds": refunds, "pagination": pagination}
         except requests.RequestException as e:
             raise APIError(f"API request failed: {e}")
         except Exception as e:
             raise RefundError(f"Error listing refunds: {e}")
 
+    def _conditional_get(
+        self, token: str, path: str, params: Optional[dict[str, Any]] = None, show_status: bool = True
+    ) -> dict[str, Any]:
+        """GET ``path`` and return its ``data`` payload, revalidating a stored copy by ETag."""
+        if not self.use_cache:
+            body = self.api_client.create_request(path=path, params=params, token=token, show_status=show_status)
+            payload: dict[str, Any] = body.get("data", {})
+            return payload
+
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        store_key = f"{token_fingerprint(token)}:{path}?{query}"
+        etag, stored = _ETAG_STORE.get(store_key)
+        response, new_etag = self.api_client.create_conditional_request(
+            path, etag=etag, params=params, token=token, show_status=show_status
+        )
+        if response is None:
+            return stored or {}
+        data: dict[str, Any] = response.get("data", {})
+        if new_etag:
+            _ETAG_STORE.set(store_key, new_etag, data)
+        return data
+
+    def iter_refund_pages(self, token: str, limit: int = 15, prefetch: int = 1) -> Iterator[dict[str, Any]]:
+        """Yield every page of refund invoices in order.
+
+        Up to ``prefetch`` following pages are fetched in the background while
+        the caller handles the current one.
+        """
+        result = self.list_refund_invoices(token, 1, limit)
+        total_pages = result["pagination"].get("totalPages", 1) or 1
+        next_page = 2
+        pending: deque[Future[dict[str, Any]]] = deque()
+        with ThreadPoolExecutor(max_workers=max(1, prefetch)) as executor:
+            while True:
+                while next_page <= total_pages and len(pending) < max(1, prefetch):
+                    pending.append(executor.submit(self.list_refund_invoices, token, next_page, limit, False))
+                    next_page += 1
+                yield result
+                if not pending:
+                    return
+                result = pending.popleft().result()
+
     def get_refund_details(self, token: str, refund_id: str) -> dict[str, Any]:
         """Fetch detailed refund invoice info."""
         try:
-            response = self.api_client.create_request(
-                path=f"{apiRoutes.refund.GET_REFUND_DETAILS}/{refund_id}", token=token
-            )
-            refund_details = response.get("data", {})
-            invoice = refund_details.get("invoice", {})
+            refund_details = self.fetch_refund_details(token, refund_id)
+            self.display_refund_details(refund_id, refund_details)
+            return refund_details
+        except Exception as e:
+            raise RefundError(f"Error fetching refund details: {e}")
 
-            Console.print_table(
-                f"Refund {refund_id}",
-                [
-                    f"{'Status:':<25} {refund_details.get('status', 'unknown').upper()}",
-                    f"{'Amount:':<25} {invoice.get('amountDue', 0)} TAO",
-                    f"{'Created:':<25} {self.to_full_date(invoice.get('createdAt'))}",
-                    f"{'Estimated refund Date:':<25} {self._get_estimated_refund_date(invoice.get('createdAt')).strftime('%A, %B %d, %Y')}",  # noqa: E501
-                ],
-            )
+    def fetch_refund_details(self, token: str, refund_id: str, show_status: bool = True) -> dict[str, Any]:
+        """Fetch the raw refund details payload without displaying it."""
+        return self._conditional_get(token, _GET_DETAILS_BASE + refund_id, show_status=show_status)
 
+    def fetch_refund_details_concurrently(self, token: str, refund_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch details for several refunds in parallel over the shared session."""
+        if not refund_ids:
+            return {}
+        try:
+            with Console.ongoing_status(f"Fetching details for {len(refund_ids)} refund(s)..."):
+                with ThreadPoolExecutor(max_workers=min(8, len(refund_ids))) as executor:
+                    results = executor.map(
+                        lambda refund_id: self.fetch_refund_details(token, refund_id, show_status=False), refund_ids
+                    )
+                    return dict(zip(refund_ids, results))
+        except requests.RequestException as e:
+            raise APIError(f"API request failed: {e}")
         except Exception as e:
             raise RefundError(f"Error fetching refund details: {e}")
 
-    def to_full_date(self, date: str):
+    def get_many_refund_details(self, token: str, refund_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch details for several refunds, in a single batch request when the backend supports it."""
+        found: dict[str, dict[str, Any]] = {}
+        missing = list(refund_ids)
+
+        if missing and settings.REFUND_BATCH_DETAILS and self._batch_supported:
+            try:
+                response = self.api_client.create_request(
+                    path=_BATCH_GET_PATH,
+                    method="POST",
+                    json_data={"ids": missing},
+                    token=token,
+                )
+            except APIResponseError as e:
+                if e.status_code not in (404, 405):
+                    raise RefundError(f"Error fetching refund details: {e}")
+                self._batch_supported = False
+            except requests.RequestException as e:
+                raise APIError(f"API request failed: {e}")
+            else:
+                data = response.get("data", [])
+                items = data.items() if isinstance(data, dict) else ((item.get("refundId"), item) for item in data)
+                for refund_id, refund_details in items:
+                    if refund_id in missing:
+                        found[refund_id] = refund_details
+                missing = [refund_id for refund_id in missing if refund_id not in found]
+
+        if missing:
+            found.update(self.fetch_refund_details_concurrently(token, missing))
+        return {refund_id: found[refund_id] for refund_id in refund_ids if refund_id in found}
+
+    def display_refund_details(self, refund_id: str, refund_details: dict[str, Any]) -> None:
+        """Display a single refund's details."""
+        invoice = refund_details.get("invoice", {})
+        Console.print_table(
+            f"Refund {refund_id}",
+            [
+                f"{'Status:':<25} {refund_details.get('status', 'unknown').upper()}",
+                f"{'Amount:':<25} {invoice.get('amountDue', 0)} TAO",
+                f"{'Created:':<25} {self.to_full_date(invoice.get('createdAt'))}",
+                f"{'Estimated refund Date:':<25} {self._get_estimated_refund_date(invoice.get('createdAt')).strftime('%A, %B %d, %Y')}",  # noqa: E501
+            ],
+        )
+
+    @staticmethod
+    def to_full_date(date: str) -> str:
         return datetime.fromisoformat(date.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
 
     def _get_estimated_refund_date(self, date: str):
@@ -117,6 +280,20 @@ class RefundManager:
         if not refunds:
             Console.warning("No refund invoices found.")
             return
+
+        # The estimate is relative to now, not to each row, so compute it once per page.
+        estimated_refund_date = str(self._get_estimated_refund_date(refunds[0].get("createdAt")))
+
+        if not sys.stdout.isatty():
+            # Output is piped: skip rich rendering and emit plain TSV for grep/cut/awk.
+            write = sys.stdout.write
+            if not self._tsv_header_written:
+                write("refundId\tamount\tstatus\tcreated\testimatedRefundDate\n")
+                self._tsv_header_written = True
+            for row in _rows_from(refunds):
+                write(f"{row.refund_id}\t{row.amount}\t{row.status}\t{row.created}\t{estimated_refund_date}\n")
+            return
+
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Refund ID", justify="center")
         table.add_column("Amount", justify="center")
@@ -124,14 +301,9 @@ class RefundManager:
         table.add_column("Created", justify="center")
         table.add_column("Estimated Refund Date")
 
-        for refund in refunds:
-            table.add_row(
-                refund.get("refundId", "N/A"),
-                str(refund.get("amountDue", 5)),
-                refund.get("status", "unknown").upper(),
-                str(self.to_full_date(refund.get("createdAt"))),
-                str(self._get_estimated_refund_date(refund.get("createdAt"))),
-            )
+        add_row = table.add_row
+        for row in _rows_from(refunds):
+            add_row(row.refund_id, row.amount, row.status, row.created, estimated_refund_date)
 
         Console.print(table)
         Console.info(f"Page {pagination.get('page', 1)} of {pagination.get('totalPages', 1)}")
@@ -0,0 +1,64 @@
+"""Reuse stored session tokens across CLI invocations."""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from poolcli.core.config import settings
+from poolcli.utils.console import Console
+from poolcli.utils.misc import get_stored_session
+
+try:
+    import fcntl
+
+    _HAS_FCNTL = True
+except ImportError:  # pragma: no cover - not available on Windows
+    _HAS_FCNTL = False
+
+
+def _stored_token(wallet_name: str) -> tuple[Optional[str], Optional[str]]:
+    """Return ``(token, backend_url)`` of the wallet's valid stored session, if any."""
+    session: Optional[dict[str, Any]] = get_stored_session(wallet_name)
+    if not session or not session.get("token"):
+        return None, None
+    return str(session["token"]), session.get("backend_url")
+
+
+@contextmanager
+def _refresh_lock() -> Iterator[None]:
+    """Serialize token refreshes between concurrent poolcli processes."""
+    if not _HAS_FCNTL:
+        yield
+        return
+    settings.CONFIG_PATH.mkdir(exist_ok=True)
+    with open(settings.CONFIG_PATH / "token.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_or_refresh(
+    wallet_name: str, backend_url: str, refresh: Callable[[bool], tuple[Optional[str], Any]]
+) -> Optional[str]:
+    """Return a stored token for the wallet, or call ``refresh(force)`` to authenticate.
+
+    A valid stored session for ``backend_url`` is returned without loading the
+    wallet. Otherwise ``refresh`` runs under a file lock so that parallel
+    invocations perform a single authentication and the others pick up the
+    freshly stored token. ``force`` is True when the stored session belongs to
+    another backend, so ``refresh`` must not hand that token back.
+    """
+    token, token_backend = _stored_token(wallet_name)
+    if token and token_backend == backend_url:
+        Console.info("Using existing valid session.")
+        return token
+
+    with _refresh_lock():
+        token, token_backend = _stored_token(wallet_name)
+        if token and token_backend == backend_url:
+            Console.info("Using existing valid session.")
+            return token
+        token, _ = refresh(token is not None)
+        return token
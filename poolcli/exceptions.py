@@ -32,3 +32,10 @@ class RefundError(PoolcliError):
 class APIError(PoolcliError):
     """Raised when API requests fail."""
     pass
+
+class APIResponseError(APIError):
+    """Raised when the API answers with an HTTP error status."""
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
@@ -1,15 +1,88 @@
-from typing import Any, Optional
+import random
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Optional, cast
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from poolcli.core.config import settings
+from poolcli.utils.cache import TTLCache, token_fingerprint
 from poolcli.utils.console import console
 from poolcli.utils.error_handler import handle_error
 from poolcli.utils.misc import get_auth_headers
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # orjson is an optional speedup (poolcli[speedups])
+    _HAS_ORJSON = False
+
+# Bounds each connection attempt (retried once, see get_session); ``timeout`` only bounds the read.
+CONNECT_TIMEOUT = 5
+
+# How long a server-issued session cookie is reused in place of the bearer token (see SESSION_COOKIE_AUTH).
+SESSION_COOKIE_TTL = 300
+
+_session: Optional[requests.Session] = None
+# Session cookies keyed by token hash, and hashes of tokens whose cookies the backend rejected.
+_session_cookies = TTLCache(maxsize=64, ttl=SESSION_COOKIE_TTL)
+_cookie_rejected: set[str] = set()
+
+
+def decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if not _HAS_ORJSON:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=response)
+
+
+class _JitteredRetry(Retry):
+    """Exponential backoff with full jitter, so rate-limited clients don't retry in lockstep."""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session, creating it on first use.
+
+    Every APIClient shares this session so that keep-alive connections (and
+    their TLS handshakes) are reused across requests to the backend.
+    """
+    global _session
+    if _session is None:
+        # POST is left out of the retried methods: replaying a 5xx'd refund or invoice
+        # creation could create it twice. Only the listed statuses get the full budget:
+        # a failed connect is retried once and a read timeout not at all, so an
+        # unreachable backend fails within two connect attempts. raise_on_status=False
+        # hands the final response to handle_error so the server's message is still shown.
+        retries = _JitteredRetry(
+            total=5,
+            connect=1,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+        _session = requests.Session()
+        # Cookies are tracked per token in _session_cookies instead of a jar shared by every wallet.
+        _session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
 
 class APIClient:
     def __init__(self, base_url: str) -> None:
         self.base_url = base_url
+        self.session = get_session()
 
     def create_request(
         self,
@@ -21,9 +94,10 @@ class APIClient:
         timeout: int = 20,
         verify: bool = True,
         token: Optional[str] = None,
+        show_status: bool = True,
     ) -> dict[Any, Any]:
         """
-        Creates a generalized HTTP request using the requests library.
+        Creates a generalized HTTP request using the shared requests session.
 
         Args:
             url (str): The URL to send the request to
@@ -31,8 +105,11 @@ class APIClient:
             params (Dict, optional): URL parameters to include in the request. Defaults to None.
             headers (Dict, optional): HTTP headers to include in the request. Defaults to None.
             json_data (Dict, optional): JSON data to send in the request body. Defaults to None.
-            timeout (int, optional): Request timeout in seconds. Defaults to 30.
+            timeout (int, optional): Read timeout in seconds; connecting is bounded by CONNECT_TIMEOUT.
+                Defaults to 20.
             verify (bool, optional): Whether to verify SSL certificates. Defaults to True.
+            show_status (bool, optional): Show a spinner while the request runs. Pass False when
+                requests are issued from worker threads, as only one live display may be active.
 
         Returns:
             requests.Response: Response object from the request
@@ -40,21 +117,104 @@ class APIClient:
         Raises:
             requests.exceptions.RequestException: For any request-related errors
         """
+        _, data = self._request(method, path, params, headers, json_data, timeout, verify, token, show_status)
+        # data is only None for a 304, which needs an If-None-Match header (see create_conditional_request).
+        return cast(dict[Any, Any], data)
+
+    def create_conditional_request(
+        self,
+        path: str,
+        etag: Optional[str] = None,
+        params: Optional[dict[str, Any]] = None,
+        token: Optional[str] = None,
+        show_status: bool = True,
+    ) -> tuple[Optional[dict[Any, Any]], Optional[str]]:
+        """
+        Sends a GET with If-None-Match when an ETag from an earlier response is known.
+
+        Returns:
+            tuple: (None, etag) when the server answers 304 Not Modified, otherwise the
+            decoded body and the response's ETag header (None if the server sent none).
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        response, data = self._request("GET", path, params, headers, token=token, show_status=show_status)
+        if response.status_code == 304:
+            return None, etag
+        return data, response.headers.get("ETag")
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, Any]] = None,
+        json_data: Optional[dict[str, Any]] = None,
+        timeout: int = 20,
+        verify: bool = True,
+        token: Optional[str] = None,
+        show_status: bool = True,
+    ) -> tuple[requests.Response, Optional[dict[Any, Any]]]:
         method = method.upper()
-        headers = get_auth_headers(token)
+        request_headers = get_auth_headers(token)
+        if headers:
+            request_headers.update(headers)
         url = f"{self.base_url.lstrip('/')}/{path.rstrip('/')}"
 
-        request_kwargs = {"url": url, "headers": headers, "params": params, "timeout": timeout, "verify": verify}
+        request_kwargs = {
+            "url": url,
+            "headers": request_headers,
+            "params": params,
+            "timeout": (CONNECT_TIMEOUT, timeout),
+            "verify": verify,
+        }
 
         if method in ["POST", "PUT", "PATCH"]:
             if json_data is not None:
                 request_kwargs["json"] = json_data
 
         try:
+            if not show_status:
+                return self._send(method, request_kwargs, token)
             with console.status(f"[bold green]Making {method} request to {url}...", spinner="earth"):
-                response = requests.request(method, **request_kwargs)
-                data = response.json()
-                handle_error(data=data, response=response)
-            return data
+                return self._send(method, request_kwargs, token)
         except requests.exceptions.RequestException:
             raise
+
+    def _send(
+        self, method: str, request_kwargs: dict[str, Any], token: Optional[str]
+    ) -> tuple[requests.Response, Optional[dict[Any, Any]]]:
+        """Send the request, preferring a cached session cookie over the bearer token.
+
+        With SESSION_COOKIE_AUTH enabled, the backend's SESSION_COOKIE_NAME cookie
+        from a successful authenticated response is remembered per token, and
+        later calls with that token send it instead of the bearer, which lets
+        the server skip re-verifying the token. A 401/403 on the cookie drops it
+        and the request is retried once with the bearer token.
+        """
+        fingerprint = token_fingerprint(token) if token and settings.SESSION_COOKIE_AUTH else None
+        if fingerprint is not None:
+            session_cookie = _session_cookies.get(fingerprint)
+            if session_cookie:
+                headers = {
+                    k: v for k, v in request_kwargs["headers"].items() if k not in ("Authorization", "x-auth-mode")
+                }
+                cookies = {settings.SESSION_COOKIE_NAME: session_cookie}
+                response = self.session.request(method, **{**request_kwargs, "headers": headers, "cookies": cookies})
+                if response.status_code not in (401, 403):
+                    return self._handle_response(response)
+                _session_cookies.pop(fingerprint)
+                _cookie_rejected.add(fingerprint)
+
+        response = self.session.request(method, **request_kwargs)
+        if fingerprint is not None and fingerprint not in _cookie_rejected and response.ok:
+            session_cookie = response.cookies.get(settings.SESSION_COOKIE_NAME)
+            if session_cookie:
+                _session_cookies.set(fingerprint, session_cookie)
+        return self._handle_response(response)
+
+    def _handle_response(self, response: requests.Response) -> tuple[requests.Response, Optional[dict[Any, Any]]]:
+        if response.status_code == 304:
+            return response, None
+        data = decode_json(response)
+        handle_error(data=data, response=response)
+        return response, data
@@ -0,0 +1,133 @@
+"""Small in-process caching helpers."""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # orjson is an optional speedup (poolcli[speedups])
+    _HAS_ORJSON = False
+
+
+def token_fingerprint(token: str) -> str:
+    """Return a short hash of a token, so raw tokens are never used as cache keys."""
+    return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop ``key`` from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class ETagStore:
+    """ETag and response body pairs persisted to a JSON file, for conditional GETs across runs.
+
+    The file is read on first use and written back once at interpreter exit
+    if anything changed. The oldest entries are dropped beyond ``maxsize``.
+    """
+
+    def __init__(self, path: Path, maxsize: int = 500) -> None:
+        self.path = path
+        self.maxsize = maxsize
+        self._data: Optional[dict[str, list[Any]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, list[Any]]:
+        if self._data is None:
+            try:
+                raw = self.path.read_bytes()
+                data = orjson.loads(raw) if _HAS_ORJSON else json.loads(raw)
+                self._data = data if isinstance(data, dict) else {}
+            except Exception:
+                self._data = {}
+        return self._data
+
+    def get(self, key: str) -> tuple[Optional[str], Optional[dict[str, Any]]]:
+        """Return ``(etag, body)`` stored under ``key``, or ``(None, None)``."""
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry:
+            return None, None
+        return entry[0], entry[1]
+
+    def set(self, key: str, etag: str, body: dict[str, Any]) -> None:
+        with self._lock:
+            data = self._load()
+            data.pop(key, None)
+            data[key] = [etag, body]
+            while len(data) > self.maxsize:
+                del data[next(iter(data))]
+            if not self._dirty:
+                self._dirty = True
+                atexit.register(self.save)
+
+    def clear(self) -> None:
+        """Drop every entry and delete the file."""
+        with self._lock:
+            self._data = {}
+            self._dirty = False
+            self.path.unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """Write the store to disk (owner-readable only) if it changed."""
+        with self._lock:
+            if not self._dirty or self._data is None:
+                return
+            try:
+                payload = orjson.dumps(self._data) if _HAS_ORJSON else json.dumps(self._data).encode()
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                # Created owner-only so cached responses are never readable by others, even briefly.
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(payload)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as _e:
+                pass
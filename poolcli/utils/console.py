@@ -1,6 +1,8 @@
 """Console output utilities"""
 
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any, Optional
 
 from rich.console import Console as RichConsole
@@ -59,6 +61,20 @@ class Console:
         """Print header message"""
         console.print(Panel(Text(msg, style="bold magenta"), expand=False))
 
+    @staticmethod
+    @contextmanager
+    def redirect_to_stderr(enabled: bool = True) -> Iterator[None]:
+        """Send console output to stderr, keeping stdout for machine-readable output"""
+        if not enabled:
+            yield
+            return
+        previous = console.stderr
+        console.stderr = True
+        try:
+            yield
+        finally:
+            console.stderr = previous
+
     @staticmethod
     def payment_status(amount, dest):
         """Print payment status"""
@@ -1,4 +1,5 @@
 import json
+import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
@@ -13,6 +14,16 @@ def get_config_file() -> Path:
     return config_path / "config.json"
 
 
+def _write_config(config_file: Path, config: dict) -> None:
+    """Write the config atomically through a temp file that is owner-only from creation."""
+    tmp_path = config_file.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(config, f, indent=2)
+    os.replace(tmp_path, config_file)
+
+
 def store_token(wallet_name: str, token: str, backend_url: str, address: str) -> None:
     """Store authentication token and metadata."""
     config_file = get_config_file()
@@ -33,8 +44,7 @@ def store_token(wallet_name: str, token: str, backend_url: str, address: str) ->
         "last_used": datetime.now(timezone.utc).isoformat(),  # noqa: UP017
     }
 
-    with open(config_file, "w") as f:
-        json.dump(config, f, indent=2)
+    _write_config(config_file, config)
 
 
 def get_stored_session(wallet_name: str) -> Optional[dict[str, dict[str, str]]]:
@@ -59,7 +69,11 @@ def get_stored_session(wallet_name: str) -> Optional[dict[str, dict[str, str]]]:
 
 
 def clear_session(wallet_name: str) -> None:
-    """Clear stored session for a wallet."""
+    """Clear stored session for a wallet.
+
+    Cached refund responses (refund_cache.json) are shared by all wallets and
+    outlive this; they are removed by ``poolcli auth logout``.
+    """
     config_file = get_config_file()
     if config_file.exists():
         try:
@@ -67,8 +81,7 @@ def clear_session(wallet_name: str) -> None:
                 config = json.load(f)
             if wallet_name in config:
                 del config[wallet_name]
-                with open(config_file, "w") as f:
-                    json.dump(config, f, indent=2)
+                _write_config(config_file, config)
         except Exception as _e:
             pass
 